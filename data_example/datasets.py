@@ -0,0 +1,205 @@
+"""
+Registry and fast loader for the CSV datasets bundled in data_example/.
+
+The first `load(name)` parses the CSV once and stores its columns as typed,
+column-major `.npy` blocks (one per dtype) under data_example/.cache/<name>/.
+Later loads memory-map the blocks and wrap only the requested columns, so
+reading the wide FRED-MD panel costs a few milliseconds instead of a parse.
+Missing values of text columns are kept in a separate boolean block and
+restored as NaN. The cache records the size and modification time of the
+source CSV and is rebuilt automatically when they change. For FRED-MD, the
+transformation-code row below the header is kept as metadata in
+`df.attrs["transform_codes"]`, not as a data row.
+
+Usage from the repository root:
+    from data_example.datasets import load
+    fred = load("fred_md", columns=["sasdate", "INDPRO", "UNRATE"])
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+DATA_DIR = Path(__file__).resolve().parent
+CACHE_DIR = DATA_DIR / ".cache"
+CACHE_VERSION = 2
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """A bundled CSV and how to parse it."""
+
+    file: str
+    read_csv: dict = field(default_factory=dict)
+    transform_row: bool = False  # FRED-MD style: first row after the header holds transformation codes
+
+
+DATASETS: dict[str, DatasetSpec] = {
+    "fred_md": DatasetSpec(
+        "fred_md.csv",
+        {"skiprows": [1], "parse_dates": ["sasdate"], "date_format": "%m/%d/%Y"},
+        transform_row=True,
+    ),
+    "ibm3jan2006": DatasetSpec("ibm3jan2006.csv"),
+    "empirical_finance": DatasetSpec("empirical_finance.csv"),
+    "AJR": DatasetSpec("AJR.csv"),
+}
+
+
+def _source_stamp(path: Path) -> dict:
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "version": CACHE_VERSION}
+
+
+def _as_storable(values: pd.Series) -> np.ndarray:
+    """A fixed-width NumPy array that can be saved as .npy and memory-mapped."""
+    if values.dtype.kind in "biufcmM":
+        return values.to_numpy()
+    # text columns become fixed-width unicode; missing values are masked separately
+    return values.astype(object).where(values.notna(), "").astype(str).to_numpy(dtype=str)
+
+
+def build_cache(name: str) -> Path:
+    """Parse the source CSV of `name` once and write its columns to the cache."""
+    spec = DATASETS[name]
+    source = DATA_DIR / spec.file
+    target = CACHE_DIR / name
+    tmp = CACHE_DIR / f"{name}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    df = pd.read_csv(source, **spec.read_csv)
+    values = {col: _as_storable(df[col]) for col in df.columns}
+
+    # Columns sharing a dtype go into one column-major block, so a load is a
+    # handful of memory maps and pandas can wrap each block without copying.
+    groups: dict[str, list[str]] = {}
+    for col, arr in values.items():
+        groups.setdefault(arr.dtype.str, []).append(col)
+    columns = {}
+    for b, (dtype, cols) in enumerate(groups.items()):
+        file = f"block{b}.npy"
+        np.save(tmp / file, np.asfortranarray(np.column_stack([values[c] for c in cols])), allow_pickle=False)
+        for j, col in enumerate(cols):
+            columns[col] = {"file": file, "index": j}
+
+    # text columns store missing values as "", so keep a mask to tell them apart
+    masked = [c for c in df.columns if values[c].dtype.kind == "U" and df[c].isna().any()]
+    if masked:
+        np.save(tmp / "nulls.npy", np.asfortranarray(np.column_stack([df[c].isna().to_numpy() for c in masked])))
+        for j, col in enumerate(masked):
+            columns[col]["null"] = j
+
+    attrs = {}
+    if spec.transform_row:
+        codes = pd.read_csv(source, nrows=1).iloc[0, 1:]
+        attrs["transform_codes"] = {col: int(code) for col, code in codes.items() if pd.notna(code)}
+
+    meta = {
+        "source": spec.file,
+        "stamp": _source_stamp(source),
+        "order": list(df.columns),
+        "rows": len(df),
+        "columns": columns,
+        "attrs": attrs,
+    }
+    (tmp / "meta.json").write_text(json.dumps(meta))
+    shutil.rmtree(target, ignore_errors=True)
+    tmp.rename(target)
+    return target
+
+
+def _meta(name: str, refresh: bool = False) -> dict:
+    spec = DATASETS[name]
+    meta_path = CACHE_DIR / name / "meta.json"
+    if not refresh and meta_path.exists():
+        meta = json.loads(meta_path.read_text())
+        if meta["stamp"] == _source_stamp(DATA_DIR / spec.file):
+            return meta
+    build_cache(name)
+    return json.loads(meta_path.read_text())
+
+
+def _blocks(name: str, meta: dict, columns: list[str] | None) -> list[tuple[list[str], np.ndarray]]:
+    """(column names, memory-mapped 2-D block) pairs covering `columns`, all if None."""
+    wanted = meta["order"] if columns is None else list(columns)
+    missing = [c for c in wanted if c not in meta["columns"]]
+    if missing:
+        raise KeyError(f"{name} has no columns {missing}")
+
+    by_file: dict[str, list[str]] = {}
+    for col in wanted:
+        by_file.setdefault(meta["columns"][col]["file"], []).append(col)
+    blocks = []
+    for file, cols in by_file.items():
+        block = np.load(CACHE_DIR / name / file, mmap_mode="r")
+        idx = [meta["columns"][c]["index"] for c in cols]
+        if idx != list(range(block.shape[1])):
+            block = block[:, idx]
+        blocks.append((cols, block))
+    return blocks
+
+
+def _null_masks(name: str, meta: dict, columns: list[str]) -> dict[str, np.ndarray]:
+    """Missing-value masks of the text columns among `columns` that have any."""
+    masked = {col: meta["columns"][col]["null"] for col in columns if "null" in meta["columns"][col]}
+    if not masked:
+        return {}
+    nulls = np.load(CACHE_DIR / name / "nulls.npy", mmap_mode="r")
+    return {col: nulls[:, j] for col, j in masked.items()}
+
+
+def load_arrays(name: str, columns: list[str] | None = None, refresh: bool = False) -> dict[str, np.ndarray]:
+    """
+    Read-only column arrays of dataset `name`, backed by the memory-mapped cache.
+
+    Text columns with missing values are the exception: they are copied to
+    object arrays holding NaN where the CSV had no value.
+    """
+    meta = _meta(name, refresh)
+    order = meta["order"] if columns is None else list(columns)
+    arrays = {col: block[:, j] for cols, block in _blocks(name, meta, order) for j, col in enumerate(cols)}
+    for col, mask in _null_masks(name, meta, order).items():
+        arrays[col] = arrays[col].astype(object)
+        arrays[col][mask] = np.nan
+    return {col: arrays[col] for col in order}
+
+
+def load(name: str, columns: list[str] | None = None, refresh: bool = False, copy: bool = False) -> pd.DataFrame:
+    """
+    Load dataset `name` (a key of `DATASETS`) as a DataFrame.
+
+    Only `columns` are read if given. Columns are backed by the memory-mapped
+    cache blocks without copying, except text columns with missing values,
+    which are copied to restore NaN. The memory maps are read-only, so by
+    default the frame is too: `df.iloc[0, 1] = 5` raises ValueError. Pass
+    `copy=True` for an ordinary, writable frame in memory. Dataset metadata, such as the FRED-MD
+    transformation codes, is in `df.attrs`.
+    """
+    meta = _meta(name, refresh)
+    order = meta["order"] if columns is None else list(columns)
+    frames = [pd.DataFrame(block, columns=cols, copy=False) for cols, block in _blocks(name, meta, order)]
+    if not frames:
+        df = pd.DataFrame(index=pd.RangeIndex(meta["rows"]))
+    else:
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, axis=1)
+    if list(df.columns) != order:
+        df = df[order]
+    for col, mask in _null_masks(name, meta, order).items():
+        df[col] = df[col].where(~mask)
+    if copy:
+        df = df.copy(deep=True)
+    df.attrs.update(meta["attrs"])
+    return df
+
+
+def transform_codes(name: str = "fred_md") -> pd.Series:
+    """FRED-MD transformation codes (1 = level, ..., 7 = percent change of ratio) by column."""
+    return pd.Series(_meta(name)["attrs"]["transform_codes"], name="tcode")
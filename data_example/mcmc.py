@@ -0,0 +1,164 @@
+"""
+Vectorized multi-chain random-walk Metropolis-Hastings sampler.
+
+K chains advance in lockstep as arrays. The log density is called once per
+step on all K proposals, so it must accept an array of shape (K, d), or
+(K,) for a scalar parameter, and return K values. Thinned draws are written
+to a preallocated (n_samples, K, d) buffer. Convergence diagnostics are
+updated online as each draw is stored:
+
+    R-hat   Gelman-Rubin, from Welford running means and variances per chain
+    ESS     effective sample size by online batch means: batch sums are
+            merged pairwise whenever the batch count doubles, so memory stays
+            fixed as the chains grow
+
+`normal_mean_loglik` shows the sufficient-statistic trick. The N(theta, sd)
+log-likelihood of a sample depends on the data only through (n, sum x,
+sum x^2), so each evaluation is O(1) in the sample size.
+
+Usage (the posterior example of py_06_integration):
+    loglik = normal_mean_loglik(x)
+    res = metropolis_chains(lambda t: loglik(t) + beta.logpdf(t, 2, 2),
+                            initial=np.full(4, 0.1), n_samples=10000, n_spac=10)
+    res.rhat, res.ess, res.draws[1000:].ravel()
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+
+def normal_mean_loglik(x: np.ndarray, sd: float = 1.0) -> Callable[[np.ndarray], np.ndarray]:
+    """Vectorized log-likelihood of x ~ N(theta, sd^2), computed from sufficient statistics."""
+    x = np.asarray(x, dtype=float)
+    n, sx, sxx = x.size, x.sum(), np.square(x).sum()
+    const = -n * np.log(sd) - 0.5 * n * np.log(2 * np.pi)
+
+    def loglik(theta):
+        theta = np.asarray(theta, dtype=float)
+        return const - (sxx - 2 * theta * sx + n * np.square(theta)) / (2 * sd**2)
+
+    return loglik
+
+
+class OnlineDiagnostics:
+    """Running R-hat and ESS over K chains of d-dimensional draws."""
+
+    def __init__(self, K: int, d: int, n_batches: int = 64):
+        self.n = 0
+        self.mean = np.zeros((K, d))
+        self.m2 = np.zeros((K, d))
+        # online batch means: up to 2 * n_batches completed batch sums per chain
+        self.cap = 2 * n_batches
+        self.batch_size = 1
+        self.batch_sums = np.zeros((K, d, self.cap))
+        self.n_full = 0
+        self.partial = np.zeros((K, d))
+        self.n_partial = 0
+
+    def update(self, draw: np.ndarray) -> None:
+        """Add one draw, shape (K, d), to every chain."""
+        self.n += 1
+        delta = draw - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (draw - self.mean)
+
+        self.partial += draw
+        self.n_partial += 1
+        if self.n_partial == self.batch_size:
+            self.batch_sums[:, :, self.n_full] = self.partial
+            self.n_full += 1
+            self.partial[:] = 0
+            self.n_partial = 0
+            if self.n_full == self.cap:
+                # merge neighbouring batches: half as many, twice as long
+                half = self.cap // 2
+                self.batch_sums[:, :, :half] = self.batch_sums[:, :, 0::2] + self.batch_sums[:, :, 1::2]
+                self.n_full = half
+                self.batch_size *= 2
+
+    @property
+    def rhat(self) -> np.ndarray:
+        """Gelman-Rubin potential scale reduction factor per parameter (needs K >= 2)."""
+        n = self.n
+        W = (self.m2 / (n - 1)).mean(axis=0)
+        B_over_n = self.mean.var(axis=0, ddof=1)
+        return np.sqrt(((n - 1) / n * W + B_over_n) / W)
+
+    @property
+    def ess(self) -> np.ndarray:
+        """Effective sample size per parameter, summed over chains."""
+        if self.n_full < 2:
+            return np.full(self.mean.shape[1], np.nan)
+        batch_means = self.batch_sums[:, :, : self.n_full] / self.batch_size
+        # long-run variance per chain: batch_size * variance of the batch means
+        lrv = self.batch_size * batch_means.var(axis=2, ddof=1)
+        var = self.m2 / (self.n - 1)
+        return (self.n * var / lrv).sum(axis=0)
+
+
+@dataclass
+class MCMCResult:
+    draws: np.ndarray  # (n_samples, K) for scalar parameters, else (n_samples, K, d)
+    acceptance: np.ndarray  # acceptance rate per chain
+    rhat: np.ndarray
+    ess: np.ndarray
+
+
+def metropolis_chains(
+    logpdf: Callable[[np.ndarray], np.ndarray],
+    initial,
+    n_samples: int,
+    n_spac: int = 1,
+    step: float = 1.0,
+    proposal: str = "uniform",
+    burn_in: int = 0,
+    seed=None,
+) -> MCMCResult:
+    """
+    Run K random-walk Metropolis chains in lockstep.
+
+    initial: starting values, shape (K,) for a scalar parameter or (K, d)
+    n_samples: number of thinned draws to keep per chain
+    n_spac: steps between two kept draws
+    step: width of the uniform proposal, or sd of the normal proposal
+    burn_in: number of kept draws left out of R-hat and ESS (they stay in `draws`)
+    """
+    initial = np.asarray(initial, dtype=float)
+    scalar = initial.ndim == 1
+    current = initial.reshape(-1, 1).copy() if scalar else initial.copy()
+    K, d = current.shape
+
+    def target(theta):
+        return np.asarray(logpdf(theta[:, 0] if scalar else theta), dtype=float)
+
+    rng = np.random.default_rng(seed)
+    draws = np.empty((n_samples, K, d))
+    diag = OnlineDiagnostics(K, d)
+    accepted = np.zeros(K)
+    current_h = target(current)
+
+    for s in range(n_samples):
+        for _ in range(n_spac):
+            if proposal == "uniform":
+                prop = current + step * (rng.random((K, d)) - 0.5)
+            else:
+                prop = current + step * rng.standard_normal((K, d))
+            prop_h = target(prop)
+            accept = np.log(rng.random(K)) < prop_h - current_h
+            current[accept] = prop[accept]
+            current_h[accept] = prop_h[accept]
+            accepted += accept
+        draws[s] = current
+        if s >= burn_in:
+            diag.update(current)
+
+    return MCMCResult(
+        draws=draws[:, :, 0] if scalar else draws,
+        acceptance=accepted / (n_samples * n_spac),
+        rhat=diag.rhat[0] if scalar else diag.rhat,
+        ess=diag.ess[0] if scalar else diag.ess,
+    )
@@ -0,0 +1,307 @@
+"""
+CPU-runnable benchmark suite for the kernels in gpu_benchmark.py and the
+project's Monte Carlo hot paths.
+
+Each (kernel, backend) pair is run a few times untimed to warm up, then timed
+`repeats` times with `time.perf_counter`; the JSON output keeps the median
+and interquartile range. Backends that are not installed are skipped, so the
+suite runs on CPU-only machines.
+
+Usage:
+    python scripts/benchmark_suite.py run --output bench.json [--quick]
+    python scripts/benchmark_suite.py compare base.json bench.json --threshold 0.1
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, ContextManager
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+try:
+    import cupy as cp
+except ImportError:
+    cp = None
+
+try:
+    import numexpr as ne
+except ImportError:
+    ne = None
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
+
+@dataclass(frozen=True)
+class Backend:
+    """An array module plus how to synchronize it and how to configure its threads."""
+
+    name: str
+    xp: object
+    sync: Callable[[], None] = lambda: None
+    limits: Callable[[], ContextManager] = contextlib.nullcontext
+    fused: bool = False
+
+
+@dataclass
+class BenchResult:
+    kernel: str
+    backend: str
+    params: dict
+    repeats: int
+    warmup: int
+    median: float
+    q1: float
+    q3: float
+    minimum: float
+    times: list[float] = field(default_factory=list)
+
+    @property
+    def iqr(self) -> float:
+        return self.q3 - self.q1
+
+
+def available_backends() -> dict[str, Backend]:
+    """Backends usable on this machine, keyed by name."""
+    backends = {"numpy": Backend("numpy", np)}
+    if threadpool_limits is not None:
+        backends["numpy-1thread"] = Backend("numpy-1thread", np, limits=lambda: threadpool_limits(limits=1))
+    if ne is not None:
+        backends["numexpr"] = Backend("numexpr", np, fused=True)
+    if cp is not None:
+        try:
+            if cp.cuda.runtime.getDeviceCount() > 0:
+                backends["cupy"] = Backend("cupy", cp, sync=cp.cuda.Stream.null.synchronize)
+        except cp.cuda.runtime.CUDARuntimeError:
+            pass
+    return backends
+
+
+# Kernels take (backend, **params) and return a zero-argument callable to time,
+# or None if the backend does not apply to the kernel.
+
+
+def elementwise(backend: Backend, size: int):
+    """Same expression as gpu_benchmark.benchmark_elementwise."""
+    xp = backend.xp
+    x = xp.asarray(np.random.default_rng(0).random(size))
+    y = xp.asarray(np.random.default_rng(1).random(size))
+    if backend.fused:
+        return lambda: ne.evaluate("2.0 * x**2 + 3.0 * y**3 + sin(x) * cos(y)", local_dict={"x": x, "y": y})
+    return lambda: 2.0 * x**2 + 3.0 * y**3 + xp.sin(x) * xp.cos(y)
+
+
+def random_stats(backend: Backend, samples: int, size: int):
+    """Same work as gpu_benchmark.benchmark_random_stats."""
+    if backend.fused:
+        return None
+    xp = backend.xp
+    rng = np.random.default_rng(0) if xp is np else xp.random.RandomState(0)
+
+    def run():
+        x = rng.standard_normal((samples, size))
+        return xp.mean(x, axis=1), xp.std(x, axis=1)
+
+    return run
+
+
+def matrix_mult(backend: Backend, size: int):
+    """Same work as gpu_benchmark.benchmark_matrix_mult."""
+    if backend.fused:
+        return None
+    xp = backend.xp
+    A = xp.asarray(np.random.default_rng(0).random((size, size)))
+    B = xp.asarray(np.random.default_rng(1).random((size, size)))
+    return lambda: A @ B
+
+
+def poisson_coverage(backend: Backend, rep: int, n: int):
+    """Vectorized CI coverage from coverage_engine."""
+    if backend.fused:
+        return None
+    from coverage_engine import coverage
+
+    name = "cupy" if backend.name == "cupy" else "numpy"
+    return lambda: coverage(rep, n, 2.0, backend=name, seed=0)
+
+
+def lp_var_chunk(backend: Backend, reps: int, T: int, horizon: int):
+    """One chunk of the LP-vs-VAR Monte Carlo: simulate, then run both batched estimators."""
+    if backend.xp is not np or backend.fused:
+        return None
+    import local_projection_vs_var as lpv
+
+    params = lpv.default_dgp_params()
+    lp_out = np.zeros((reps, horizon + 1, params.n_vars))
+    var_out = np.zeros_like(lp_out)
+    seed_seq = np.random.SeedSequence(0)
+    return lambda: lpv.simulate_chunk(lp_out, var_out, seed_seq, params, T, 100, horizon, 1)
+
+
+KERNELS: dict[str, tuple[Callable, dict, dict]] = {
+    # name: (kernel, full-size params, --quick params)
+    "elementwise": (elementwise, {"size": 10_000_000}, {"size": 1_000_000}),
+    "random_stats": (random_stats, {"samples": 100_000, "size": 1000}, {"samples": 10_000, "size": 100}),
+    "matrix_mult": (matrix_mult, {"size": 2048}, {"size": 512}),
+    "poisson_coverage": (poisson_coverage, {"rep": 1_000_000, "n": 5}, {"rep": 100_000, "n": 5}),
+    "lp_var_chunk": (lp_var_chunk, {"reps": 100, "T": 200, "horizon": 12}, {"reps": 25, "T": 200, "horizon": 12}),
+}
+
+
+def time_callable(fn: Callable[[], object], sync: Callable[[], None], repeats: int, warmup: int) -> list[float]:
+    """Run `fn` `warmup` times untimed, then return `repeats` wall times from perf_counter."""
+    for _ in range(warmup):
+        fn()
+        sync()
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        sync()
+        times.append(time.perf_counter() - t0)
+    return times
+
+
+def run_suite(
+    kernels: list[str] | None = None,
+    backends: list[str] | None = None,
+    repeats: int = 7,
+    warmup: int = 2,
+    quick: bool = False,
+) -> list[BenchResult]:
+    available = available_backends()
+    results = []
+    for kernel_name in kernels or list(KERNELS):
+        kernel, full_params, quick_params = KERNELS[kernel_name]
+        params = quick_params if quick else full_params
+        for backend_name in backends or list(available):
+            if backend_name not in available:
+                print(f"skip {kernel_name}/{backend_name}: backend not available")
+                continue
+            backend = available[backend_name]
+            with backend.limits():
+                fn = kernel(backend, **params)
+                if fn is None:
+                    continue
+                times = time_callable(fn, backend.sync, repeats, warmup)
+            q1, median, q3 = np.percentile(times, [25, 50, 75])
+            result = BenchResult(
+                kernel=kernel_name,
+                backend=backend_name,
+                params=params,
+                repeats=repeats,
+                warmup=warmup,
+                median=float(median),
+                q1=float(q1),
+                q3=float(q3),
+                minimum=float(min(times)),
+                times=times,
+            )
+            print(f"{kernel_name:<18} {backend_name:<14} median {result.median:.5f}s  IQR {result.iqr:.5f}s")
+            results.append(result)
+    return results
+
+
+def environment_info() -> dict:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "numexpr": getattr(ne, "__version__", None),
+        "cupy": getattr(cp, "__version__", None),
+    }
+
+
+def save_results(results: list[BenchResult], path: str | Path) -> None:
+    payload = {"environment": environment_info(), "results": [asdict(r) for r in results]}
+    Path(path).write_text(json.dumps(payload, indent=2))
+
+
+def compare_results(base_path: str | Path, new_path: str | Path, threshold: float = 0.10) -> list[dict]:
+    """
+    Compare two JSON runs and return one row per common (kernel, backend, params).
+
+    A row is a regression when the new median is more than `threshold` slower
+    than the base median and the gap also exceeds the larger of the two IQRs,
+    so run-to-run noise on shared CI machines is not flagged.
+    """
+    def load(path):
+        data = json.loads(Path(path).read_text())
+        return {(r["kernel"], r["backend"], json.dumps(r["params"], sort_keys=True)): r for r in data["results"]}
+
+    base, new = load(base_path), load(new_path)
+    rows = []
+    for key in sorted(base.keys() & new.keys()):
+        b, n = base[key], new[key]
+        ratio = n["median"] / b["median"]
+        noise = max(b["q3"] - b["q1"], n["q3"] - n["q1"])
+        rows.append(
+            {
+                "kernel": key[0],
+                "backend": key[1],
+                "base": b["median"],
+                "new": n["median"],
+                "ratio": ratio,
+                "regression": ratio > 1.0 + threshold and n["median"] - b["median"] > noise,
+            }
+        )
+    return rows
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="NumPy/numexpr/CuPy benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Run the benchmarks")
+    run.add_argument("--kernels", nargs="+", choices=sorted(KERNELS), default=None)
+    run.add_argument("--backends", nargs="+", default=None, help="Default: all available")
+    run.add_argument("--repeats", type=int, default=7)
+    run.add_argument("--warmup", type=int, default=2)
+    run.add_argument("--quick", action="store_true", help="Smaller problem sizes for CI")
+    run.add_argument("--output", type=str, default=None, help="Write results as JSON")
+
+    compare = sub.add_parser("compare", help="Flag regressions between two JSON runs")
+    compare.add_argument("base", type=str)
+    compare.add_argument("new", type=str)
+    compare.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown to flag")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.command == "run":
+        results = run_suite(args.kernels, args.backends, args.repeats, args.warmup, args.quick)
+        if args.output:
+            save_results(results, args.output)
+            print(f"Saved results to {args.output}")
+        return 0
+
+    rows = compare_results(args.base, args.new, args.threshold)
+    for row in rows:
+        flag = "REGRESSION" if row["regression"] else ""
+        print(
+            f"{row['kernel']:<18} {row['backend']:<14} {row['base']:.5f}s -> {row['new']:.5f}s "
+            f"({row['ratio']:.2f}x) {flag}"
+        )
+    return 1 if any(row["regression"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
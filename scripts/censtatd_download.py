@@ -1,7 +1,11 @@
 import os
 import json
+import shutil
+import argparse
 import requests
-import pandas as pd
+
+from http_cache import get_session
+from json_stream import convert_json
 
 URL = (
     "https://www.censtatd.gov.hk/api/get.php?id=310-31003&lang=en&param="
@@ -22,75 +26,52 @@ def fetch_api(url: str, timeout: int = 20, headers: dict | None = None) -> reque
     hdrs = DEFAULT_HEADERS.copy()
     if headers:
         hdrs.update(headers)
-    resp = requests.get(url, timeout=timeout, headers=hdrs)
+    # served from the on-disk cache when fresh or unchanged (see http_cache.py)
+    resp = get_session().get(url, timeout=timeout, headers=hdrs)
     # If server blocks the request, raise_for_status will show 403; caller may catch
     resp.raise_for_status()
     return resp
 
 
-def save_text(text: str, path: str) -> None:
-    with open(path, "w", encoding="utf8") as f:
-        f.write(text)
-
-
-def try_parse_json(text: str):
-    try:
-        return json.loads(text)
-    except Exception:
-        return None
-
-
-def json_to_csv(obj, out_csv_path: str) -> bool:
-    # Try common structures: list of dicts, or dict with 'data' key
-    df = None
-    if isinstance(obj, list):
-        if len(obj) > 0 and isinstance(obj[0], dict):
-            df = pd.DataFrame(obj)
-    elif isinstance(obj, dict):
-        # common payloads put the records under a key like 'data' or 'result'
-        for k in ("data", "result", "records", "rows"):
-            if k in obj and isinstance(obj[k], list):
-                df = pd.DataFrame(obj[k])
-                break
-        # fallback: if values are a dict of lists, convert
-        if df is None:
-            # try to find a list-of-dicts among dict values
-            for v in obj.values():
-                if isinstance(v, list) and len(v) > 0 and isinstance(v[0], dict):
-                    df = pd.DataFrame(v)
-                    break
-    if df is None:
-        return False
-    # write CSV with UTF-8
-    df.to_csv(out_csv_path, index=False)
-    return True
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Download a CENSTATD table and convert it to a columnar file")
+    parser.add_argument("--format", choices=["csv", "parquet", "arrow"], default="csv", help="Output format")
+    parser.add_argument("--pretty", action="store_true", help="Also write a pretty-printed JSON copy")
+    parser.add_argument("--batch-size", type=int, default=50_000, help="Records per written batch")
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
     out_dir = os.path.join(os.getcwd(), "data_example")
     os.makedirs(out_dir, exist_ok=True)
     raw_path = os.path.join(out_dir, "censtatd_raw.json")
     pretty_path = os.path.join(out_dir, "censtatd_pretty.json")
-    csv_path = os.path.join(out_dir, "censtatd.csv")
+    suffix = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}[args.format]
+    table_path = os.path.join(out_dir, "censtatd" + suffix)
 
     print("Fetching:", URL)
-    resp = fetch_api(URL)
-    text = resp.text
-    save_text(text, raw_path)
+    # the body is streamed to disk and never held in memory as a whole
+    body_path = get_session().download(URL, headers=DEFAULT_HEADERS)
+    shutil.copyfile(body_path, raw_path)
     print(f"Saved raw response: {raw_path}")
 
-    obj = try_parse_json(text)
-    if obj is not None:
+    try:
+        rows = convert_json(body_path, table_path, fmt=args.format, batch_size=args.batch_size)
+    except ValueError:
+        print("Response is not valid JSON; saved raw text only.")
+        return
+    if rows:
+        print(f"Saved {rows} records: {table_path}")
+    else:
+        print(f"Could not convert JSON to {args.format} automatically")
+
+    if args.pretty:
+        with open(body_path, encoding="utf8") as f:
+            obj = json.load(f)
         with open(pretty_path, "w", encoding="utf8") as f:
             json.dump(obj, f, indent=2, ensure_ascii=False)
         print(f"Saved parsed JSON: {pretty_path}")
-        converted = json_to_csv(obj, csv_path)
-        if converted:
-            print(f"Saved CSV: {csv_path}")
-        else:
-            print("Could not convert JSON to CSV automatically")
-    else:
-        print("Response is not valid JSON; saved raw text only.")
 
 
 if __name__ == "__main__":
@@ -1,34 +1,14 @@
 # AI generated
 
 import os
-import requests
-import pandas as pd
 import matplotlib.pyplot as plt
 
+from worldbank import SeriesSpec, fetch_series
+
 
 def fetch_gdp(start=1960, end=2024):
-    url = (
-        f"http://api.worldbank.org/v2/country/CHN/indicator/NY.GDP.MKTP.CD"
-        f"?format=json&date={start}:{end}&per_page=1000"
-    )
-    resp = requests.get(url, timeout=20)
-    resp.raise_for_status()
-    data = resp.json()
-    if not isinstance(data, list) or len(data) < 2:
-        raise RuntimeError("Unexpected World Bank response format")
-    records = data[1]
-    rows = []
-    for r in records:
-        year = r.get("date")
-        val = r.get("value")
-        if val is None:
-            continue
-        try:
-            rows.append({"year": int(year), "gdp_usd": float(val)})
-        except Exception:
-            continue
-    df = pd.DataFrame(rows).sort_values("year").reset_index(drop=True)
-    return df
+    df = fetch_series([SeriesSpec("CHN", "NY.GDP.MKTP.CD", start, end)])
+    return df.rename(columns={"value": "gdp_usd"})[["year", "gdp_usd"]]
 
 
 def plot_gdp(df, out_path):
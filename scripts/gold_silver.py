@@ -4,24 +4,115 @@
 
 import os
 from datetime import date
+from typing import Protocol
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-import yfinance as yf
-
-def fetch_prices(start):
-
-    tickers = {"Gold": "GC=F", "Silver": "SI=F"}
-    # yfinance allows downloading multiple tickers
-    df = yf.download(list(tickers.values()), start=start, progress=False)
-    # `Adj Close` is preferred for closing prices; fallback to `Close`
-    if ("Adj Close" in df.columns.get_level_values(0)):
-        adj = df["Adj Close"].copy()
-    else:
-        adj = df["Close"].copy()
+
+TICKERS = {"Gold": "GC=F", "Silver": "SI=F"}
+
+
+class PriceProvider(Protocol):
+    """Source of daily closing prices; swap in a fake for offline tests."""
+
+    def download(self, tickers: list[str], start, end=None) -> pd.DataFrame:
+        """Closing prices indexed by date, one column per ticker symbol."""
+        ...
+
+
+class YahooProvider:
+    def download(self, tickers, start, end=None):
+        import yfinance as yf
+
+        # yfinance allows downloading multiple tickers
+        df = yf.download(tickers, start=start, end=end, progress=False)
+        # `Adj Close` is preferred for closing prices; fallback to `Close`
+        if ("Adj Close" in df.columns.get_level_values(0)):
+            return df["Adj Close"].copy()
+        return df["Close"].copy()
+
+
+def _lines_backwards(f, start, block=4096):
+    """(offset, line) for each non-empty line after byte `start` of binary file `f`, last line first."""
+    pos = f.seek(0, os.SEEK_END)
+    head = b""  # bytes of a line cut by the block boundary, completed by the next read
+    while pos > start:
+        step = min(block, pos - start)
+        pos -= step
+        f.seek(pos)
+        lines = (f.read(step) + head).split(b"\n")
+        head = lines[0] if pos > start else b""
+        offsets = pos + np.cumsum([0] + [len(line) + 1 for line in lines[:-1]])
+        for i in range(len(lines) - 1, 0 if pos > start else -1, -1):
+            if lines[i].strip():
+                yield int(offsets[i]), lines[i]
+
+
+def _line_date(line):
+    return pd.Timestamp(line.split(b",", 1)[0].decode("utf8"))
+
+
+def last_stored_date(store):
+    """Last date in the CSV store, read from the final line only; None if there is no store."""
+    if not os.path.exists(store) or os.path.getsize(store) == 0:
+        return None
+    with open(store, "rb") as f:
+        f.readline()  # header
+        last = next(_lines_backwards(f, f.tell()), None)
+    return None if last is None else _line_date(last[1])
+
+
+def append_prices(store, new: pd.DataFrame) -> None:
+    """
+    Append `new` to the CSV store, replacing stored rows from its first date on.
+
+    Rows before the overlap are left untouched on disk: the file is truncated
+    at the first row dated on/after `new.index.min()` and the merged tail is
+    appended, so only the revision window is rewritten. The rows to replace
+    are found by reading the file backwards from the end, so the cost depends
+    on the overlap and not on the length of the stored history.
+    """
+    if new.empty:
+        return
+    if not os.path.exists(store):
+        new.to_csv(store)
+        return
+    cutoff = new.index.min()
+    with open(store, "r+b") as f:
+        header = f.readline()
+        offset = f.seek(0, os.SEEK_END)
+        for start, line in _lines_backwards(f, len(header)):
+            if _line_date(line) < cutoff:
+                break
+            offset = start
+        f.truncate(offset)
+    columns = header.decode("utf8").strip().split(",")[1:]
+    new.reindex(columns=columns).to_csv(store, mode="a", header=False)
+
+
+def fetch_prices(start, provider: PriceProvider | None = None, store=None, overlap_days=5, end=None):
+    """
+    Daily Gold and Silver closing prices from `start`.
+
+    With `store` (a CSV path) the call is incremental: only the window from
+    the last stored date minus `overlap_days` is downloaded, so late
+    revisions are picked up. The new rows are de-duplicated against the
+    store and appended to it, and the full merged series is returned.
+    """
+    provider = provider or YahooProvider()
+    last = last_stored_date(store) if store else None
+    window_start = start if last is None else max(pd.Timestamp(start), last - pd.Timedelta(days=overlap_days))
+
+    adj = provider.download(list(TICKERS.values()), start=window_start, end=end)
     # rename columns to readable names
-    col_map = {v: k for k, v in tickers.items()}
+    col_map = {v: k for k, v in TICKERS.items()}
     adj = adj.rename(columns=col_map)
-    return adj
+    adj = adj[~adj.index.duplicated(keep="last")].sort_index()
+    if store is None:
+        return adj
+
+    append_prices(store, adj)
+    return pd.read_csv(store, index_col=0, parse_dates=True)
 
 
 def plot_series(df: pd.DataFrame, out_png: str):
@@ -55,12 +146,12 @@ def plot_series(df: pd.DataFrame, out_png: str):
 
 def main():
     start_date = "2025-07-01"
-    df = fetch_prices(start=start_date) # it does not mention the end date
     out_dir = os.path.join(os.getcwd(), "data_example")
     os.makedirs(out_dir, exist_ok=True)
     csv_path = os.path.join(out_dir, "gold_silver.csv")
     png_path = os.path.join(out_dir, "gold_silver.png")
-    df.to_csv(csv_path)
+    # incremental: only the days after the last stored date are downloaded
+    df = fetch_prices(start=start_date, store=csv_path) # it does not mention the end date
     plot_series(df, png_path)
     print(f"Saved CSV: {csv_path}")
     print(f"Saved plot: {png_path}")
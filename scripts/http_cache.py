@@ -0,0 +1,217 @@
+"""
+On-disk HTTP response cache shared by the data download scripts.
+
+Responses are stored under a key derived from the URL and query parameters
+(`<sha256>.body` + `<sha256>.json`). A cached entry younger than its TTL is
+served without touching the network. Older entries are revalidated with
+If-None-Match / If-Modified-Since, so unchanged data costs a 304 and no body.
+In offline mode everything is served from the cache, and a miss is an error.
+
+Environment variables:
+    HTTP_CACHE_DIR      cache location (default: data_example/.http_cache)
+    HTTP_CACHE_TTL      freshness lifetime in seconds (default: 86400)
+    HTTP_CACHE_OFFLINE  set to 1 to never touch the network
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+DEFAULT_CACHE_DIR = Path("data_example") / ".http_cache"
+DEFAULT_TTL = 24 * 3600
+DEFAULT_POOL_SIZE = 16
+
+
+class CacheMiss(RuntimeError):
+    """Raised in offline mode when a request has no cached response."""
+
+
+def cache_key(url: str, params: dict | None = None) -> str:
+    """Stable key for a GET request: sha256 of the URL and its sorted query parameters."""
+    items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+    return hashlib.sha256(json.dumps([url, items]).encode("utf8")).hexdigest()
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes")
+
+
+class CachedSession:
+    """
+    A `requests.Session` wrapper with a persistent, revalidating response cache.
+
+    `pool_size` is the number of connections kept per host, i.e. how many
+    requests can be in flight at once from threads without waiting for a
+    socket. It is applied when the session is created; a session passed in
+    keeps its own adapters unless `pool_size` is given.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        ttl: float | None = None,
+        offline: bool | None = None,
+        headers: dict | None = None,
+        session: requests.Session | None = None,
+        pool_size: int | None = None,
+    ):
+        self.cache_dir = Path(cache_dir or os.environ.get("HTTP_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.ttl = float(ttl if ttl is not None else os.environ.get("HTTP_CACHE_TTL", DEFAULT_TTL))
+        self.offline = _env_flag("HTTP_CACHE_OFFLINE") if offline is None else offline
+        self.session = session or requests.Session()
+        if pool_size is None and session is None:
+            pool_size = DEFAULT_POOL_SIZE
+        self.pool_size = pool_size
+        if pool_size is not None:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        return self.cache_dir / f"{key}.body", self.cache_dir / f"{key}.json"
+
+    def _load_meta(self, key: str) -> dict | None:
+        body_path, meta_path = self._paths(key)
+        if not (body_path.exists() and meta_path.exists()):
+            return None
+        return json.loads(meta_path.read_text(encoding="utf8"))
+
+    def _store(self, key: str, meta: dict, body: bytes | None = None) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        body_path, meta_path = self._paths(key)
+        # write-then-rename so an interrupted run never leaves a torn entry
+        if body is not None:
+            tmp = body_path.with_suffix(".body.tmp")
+            tmp.write_bytes(body)
+            os.replace(tmp, body_path)
+        tmp = meta_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(meta), encoding="utf8")
+        os.replace(tmp, meta_path)
+
+    def invalidate(self, url: str, params: dict | None = None) -> None:
+        """Drop the cached response of a request, e.g. one whose body turned out to be unusable."""
+        for path in self._paths(cache_key(url, params)):
+            path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _to_response(meta: dict, body: bytes, from_cache: bool) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = meta["status_code"]
+        resp.url = meta["url"]
+        resp.headers = CaseInsensitiveDict(meta["headers"])
+        resp.encoding = meta.get("encoding")
+        resp._content = body
+        resp.from_cache = from_cache
+        return resp
+
+    def _request(
+        self,
+        url: str,
+        params: dict | None,
+        timeout: float,
+        headers: dict | None,
+        ttl: float | None,
+        stream: bool,
+    ) -> tuple[str, dict, requests.Response | None]:
+        """Return (key, meta, response); response is None when the cached body is to be used."""
+        key = cache_key(url, params)
+        meta = self._load_meta(key)
+        ttl = self.ttl if ttl is None else ttl
+
+        if meta is not None:
+            if self.offline or time.time() - meta["fetched_at"] < ttl:
+                return key, meta, None
+        elif self.offline:
+            raise CacheMiss(f"Offline and no cached response for {url} {params or ''}")
+
+        hdrs = dict(headers or {})
+        if meta is not None:
+            if meta.get("etag"):
+                hdrs["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                hdrs["If-Modified-Since"] = meta["last_modified"]
+
+        resp = self.session.get(url, params=params, timeout=timeout, headers=hdrs, stream=stream)
+        if resp.status_code == 304 and meta is not None:
+            resp.close()
+            meta["fetched_at"] = time.time()
+            self._store(key, meta)
+            return key, meta, None
+
+        resp.raise_for_status()
+        meta = {
+            "url": resp.url,
+            "status_code": resp.status_code,
+            "headers": dict(resp.headers),
+            "encoding": resp.encoding,
+            "etag": resp.headers.get("ETag"),
+            "last_modified": resp.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }
+        return key, meta, resp
+
+    def get(
+        self,
+        url: str,
+        params: dict | None = None,
+        timeout: float = 20,
+        headers: dict | None = None,
+        ttl: float | None = None,
+    ) -> requests.Response:
+        """GET `url`, answering from the cache when it is fresh, valid (304) or offline."""
+        key, meta, resp = self._request(url, params, timeout, headers, ttl, stream=False)
+        if resp is None:
+            body = self._paths(key)[0].read_bytes()
+            return self._to_response(meta, body, from_cache=True)
+
+        self._store(key, meta, resp.content)
+        resp.from_cache = False
+        return resp
+
+    def download(
+        self,
+        url: str,
+        params: dict | None = None,
+        timeout: float = 20,
+        headers: dict | None = None,
+        ttl: float | None = None,
+        chunk_size: int = 1 << 20,
+    ) -> Path:
+        """
+        Like `get`, but stream the body to the cache file and return its path.
+
+        The body is never held in memory, which suits payloads of hundreds of MB.
+        """
+        key, meta, resp = self._request(url, params, timeout, headers, ttl, stream=True)
+        body_path = self._paths(key)[0]
+        if resp is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = body_path.with_suffix(".body.tmp")
+            with resp, open(tmp, "wb") as f:
+                for chunk in resp.iter_content(chunk_size):
+                    f.write(chunk)
+            os.replace(tmp, body_path)
+            self._store(key, meta)
+        return body_path
+
+
+_default_session: CachedSession | None = None
+
+
+def get_session() -> CachedSession:
+    """Process-wide cached session, so every fetch reuses one connection pool."""
+    global _default_session
+    if _default_session is None:
+        _default_session = CachedSession()
+    return _default_session
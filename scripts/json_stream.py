@@ -0,0 +1,353 @@
+"""
+Streaming conversion of large JSON API payloads to CSV / Parquet / Arrow.
+
+`iter_records` reads a JSON document incrementally and yields the objects of
+its record array one at a time. The array is found without building the
+whole document: it is the top-level array, or else the first array of
+objects under a record-like key ("data", "result", "records", "rows"), at
+any depth. Only when there is none does any other array of objects directly
+under the top-level object qualify, found by a second pass after seeking back
+to the start (a stream that cannot seek gets one pass that takes the first
+qualifying array of either kind). `convert_json` groups the records
+into batches and writes each batch as it arrives, so peak memory is bounded
+by `batch_size` and not by the payload size.
+
+Records need not share keys or value types. The output columns are the
+union of all keys, and a column type is widened when a later batch needs
+it (null to any type, int64 to double, conflicting types to string). A
+widening closes the output, copies what was written so far into a new file
+with the wider schema, and carries on, so it costs one rewrite per change.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import os
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+RECORD_KEYS = ("data", "result", "records", "rows")
+_WHITESPACE = " \t\r\n"
+
+
+class _Reader:
+    """Incrementally decoded text buffer over a binary file."""
+
+    def __init__(self, f: BinaryIO, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk, dropping consumed text; False once the input is exhausted."""
+        if self.eof:
+            return False
+        data = self.f.read(self.chunk_size)
+        self.eof = not data
+        self.buf = self.buf[self.pos :] + self.decoder.decode(data, final=self.eof)
+        self.pos = 0
+        return True
+
+    def peek(self) -> str | None:
+        while self.pos >= len(self.buf):
+            if not self.fill():
+                return None
+        return self.buf[self.pos]
+
+    def skip_whitespace(self) -> str | None:
+        while True:
+            ch = self.peek()
+            if ch is None or ch not in _WHITESPACE:
+                return ch
+            self.pos += 1
+
+
+def _seek_record_array(reader: _Reader, accept: Callable[[int, str | None], bool]) -> bool:
+    """
+    Advance to the first element of the record array; False if there is none.
+
+    The record array is the first array whose first element is an object and
+    for which accept(depth, key) holds, with `depth` the nesting level of the
+    array and `key` the object key it is stored under (None in an array).
+    """
+    stack: list[str] = []
+    in_string = escape = False
+    string: list[str] = []
+    last_string = last_key = None
+    candidate = False
+
+    while True:
+        ch = reader.peek()
+        if ch is None:
+            return False
+
+        if in_string:
+            reader.pos += 1
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+                last_string = "".join(string)
+            elif len(string) < 256:
+                string.append(ch)
+            continue
+
+        if ch in _WHITESPACE:
+            reader.pos += 1
+            continue
+
+        if candidate:
+            candidate = False
+            if ch == "{":
+                return True
+
+        reader.pos += 1
+        if ch == '"':
+            in_string, string = True, []
+        elif ch == ":":
+            last_key = last_string
+        elif ch == ",":
+            last_key = None
+        elif ch == "{":
+            stack.append(ch)
+            last_key = None
+        elif ch == "[":
+            depth = len(stack)
+            key = last_key if depth and stack[-1] == "{" else None
+            candidate = accept(depth, key)
+            stack.append(ch)
+        elif ch in "}]":
+            opener = "[" if ch == "]" else "{"
+            if not stack or stack.pop() != opener:
+                raise ValueError(f"Unbalanced {ch!r} in JSON input")
+
+
+def _record_key_array(depth: int, key: str | None) -> bool:
+    return depth == 0 or key in RECORD_KEYS
+
+
+def _root_array(depth: int, key: str | None) -> bool:
+    return depth == 1 and key is not None
+
+
+def _any_root_array(depth: int, key: str | None) -> bool:
+    return _record_key_array(depth, key) or _root_array(depth, key)
+
+
+def iter_records(f: BinaryIO, records_key: str | None = None, chunk_size: int = 1 << 20) -> Iterator[dict]:
+    """
+    Yield the objects of the record array in a binary JSON stream.
+
+    With `records_key`, the record array is the first array of objects stored
+    under that key, at any depth.
+    """
+    if records_key is not None:
+        passes = [lambda depth, key: key == records_key]
+    else:
+        passes = [_record_key_array, _root_array] if f.seekable() else [_any_root_array]
+
+    start = f.tell() if len(passes) > 1 else None
+    for i, accept in enumerate(passes):
+        if i:
+            f.seek(start)
+        reader = _Reader(f, chunk_size)
+        if _seek_record_array(reader, accept):
+            break
+    else:
+        return
+    decoder = json.JSONDecoder()
+
+    while True:
+        try:
+            record, end = decoder.raw_decode(reader.buf, reader.pos)
+        except json.JSONDecodeError:
+            if not reader.fill():
+                raise
+            continue
+        reader.pos = end
+        yield record
+
+        ch = reader.skip_whitespace()
+        if ch == ",":
+            reader.pos += 1
+            reader.skip_whitespace()
+        elif ch == "]" or ch is None:
+            return
+        else:
+            raise ValueError(f"Unexpected character {ch!r} in record array")
+
+
+def _batches(records: Iterator[dict], batch_size: int) -> Iterator[pd.DataFrame]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield pd.DataFrame(batch)
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch)
+
+
+def _promote(a: "pa.DataType", b: "pa.DataType") -> "pa.DataType":
+    """Narrowest type both a and b cast to."""
+    if a == b or pa.types.is_null(b):
+        return a
+    if pa.types.is_null(a):
+        return b
+    try:
+        merged = pa.unify_schemas([pa.schema([("x", a)]), pa.schema([("x", b)])], promote_options="permissive")
+        return merged.field("x").type
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.string()
+
+
+def _to_arrow(df: pd.DataFrame) -> "pa.Table":
+    """Arrow table of a batch; a column mixing value types is stored as text."""
+    arrays = []
+    for name in df.columns:
+        col = df[name]
+        try:
+            arrays.append(pa.array(col, from_pandas=True))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            text = [v if isinstance(v, str) else json.dumps(v) for v in col[col.notna()]]
+            values = pd.Series(None, index=col.index, dtype=object)
+            values[col.notna()] = text
+            arrays.append(pa.array(values, type=pa.string(), from_pandas=True))
+    return pa.Table.from_arrays(arrays, names=[str(c) for c in df.columns])
+
+
+def _conform(table: "pa.Table", schema: "pa.Schema") -> "pa.Table":
+    """Cast `table` to `schema`, filling absent columns with nulls."""
+    columns = [
+        table.column(f.name).cast(f.type) if f.name in table.column_names else pa.nulls(len(table), f.type)
+        for f in schema
+    ]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+class _ArrowWriter:
+    def __init__(self, path: Path, fmt: str):
+        if pa is None:
+            raise ImportError("pyarrow is required for Parquet/Arrow output")
+        self.path, self.fmt = path, fmt
+        self.schema = None
+        self.writer = None
+
+    def _open(self, schema: "pa.Schema") -> None:
+        self.schema = schema
+        if self.fmt == "parquet":
+            self.writer = pq.ParquetWriter(self.path, schema)
+        else:
+            self.writer = pa.ipc.new_file(str(self.path), schema)
+
+    def _batches_written(self, path: Path) -> Iterator["pa.RecordBatch"]:
+        if self.fmt == "parquet":
+            yield from pq.ParquetFile(path).iter_batches()
+        else:
+            with pa.ipc.open_file(str(path)) as reader:
+                for i in range(reader.num_record_batches):
+                    yield reader.get_batch(i)
+
+    def _widen(self, schema: "pa.Schema") -> None:
+        """Reopen the output with `schema` and copy the rows written so far into it."""
+        self.writer.close()
+        old = self.path.with_name(self.path.name + ".widen")
+        os.replace(self.path, old)
+        self._open(schema)
+        try:
+            for batch in self._batches_written(old):
+                self.writer.write_table(_conform(pa.Table.from_batches([batch]), schema))
+        finally:
+            old.unlink()
+
+    def write(self, df: pd.DataFrame) -> None:
+        table = _to_arrow(df)
+        if self.schema is None:
+            self._open(table.schema)
+        else:
+            fields = {f.name: f.type for f in self.schema}
+            for f in table.schema:
+                fields[f.name] = _promote(fields[f.name], f.type) if f.name in fields else f.type
+            schema = pa.schema(list(fields.items()))
+            if not schema.equals(self.schema):
+                self._widen(schema)
+        self.writer.write_table(_conform(table, self.schema))
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+class _CsvWriter:
+    def __init__(self, path: Path):
+        self.path = path
+        self.columns = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.columns is None:
+            self.columns = list(df.columns)
+            df.to_csv(self.path, index=False)
+            return
+        new = [c for c in df.columns if c not in self.columns]
+        if new:
+            # rewrite the rows so far under the wider header, text unchanged
+            self.columns += new
+            old = self.path.with_name(self.path.name + ".widen")
+            os.replace(self.path, old)
+            try:
+                header = True
+                for part in pd.read_csv(old, dtype=str, keep_default_na=False, chunksize=50_000):
+                    part.reindex(columns=self.columns).to_csv(self.path, mode="w" if header else "a", header=header, index=False)
+                    header = False
+            finally:
+                old.unlink()
+        df.reindex(columns=self.columns).to_csv(self.path, mode="a", header=False, index=False)
+
+    def close(self) -> None:
+        pass
+
+
+def convert_json(
+    src: str | Path | BinaryIO,
+    out_path: str | Path,
+    fmt: str | None = None,
+    batch_size: int = 50_000,
+    records_key: str | None = None,
+) -> int:
+    """
+    Stream the record array of `src` into `out_path` and return the number of rows.
+
+    `fmt` is "csv", "parquet" or "arrow" and defaults to the suffix of
+    `out_path`. Keys first seen in later batches become new columns, empty
+    in the earlier rows.
+    """
+    out_path = Path(out_path)
+    fmt = fmt or {".parquet": "parquet", ".arrow": "arrow", ".feather": "arrow"}.get(out_path.suffix, "csv")
+    f = open(src, "rb") if isinstance(src, (str, Path)) else src
+    rows = 0
+    writer = _ArrowWriter(out_path, fmt) if fmt in ("parquet", "arrow") else _CsvWriter(out_path)
+    try:
+        for df in _batches(iter_records(f, records_key), batch_size):
+            writer.write(df)
+            rows += len(df)
+    finally:
+        writer.close()
+        if f is not src:
+            f.close()
+    return rows
@@ -15,6 +15,14 @@ def CI(x):
     return {"lower": lower, "upper": upper}
 
 
+def capture_batch(rng, size):
+    # `size` replications at once, drawn from the task's own random stream
+    x = rng.poisson(mu, (size, sample_size))
+    xbar = np.mean(x, axis=1)
+    margin = 1.96 / np.sqrt(sample_size) * np.std(x, axis=1)
+    return (xbar - margin <= mu) & (mu <= xbar + margin)
+
+
 def capture(i):
     x = np.random.poisson(mu, sample_size)
     bounds = CI(x)  # You need to define the CI function in Python
@@ -34,6 +42,15 @@ pts1 = time.time() - pts0  # check time elapsed
 print(f"* single-core loop takes {pts1} seconds")
 
 
+# vectorized, memory-bounded engine (NumPy on CPU, CuPy if a GPU is present)
+from coverage_engine import coverage
+
+pts0 = time.time()
+cov = coverage(Rep, sample_size, mu, interval="normal")
+pts1 = time.time() - pts0
+print(f"* vectorized engine takes {pts1} seconds, coverage = {cov:.4f}")
+
+
 # start parallel execution
 from multiprocessing import Pool
 
@@ -47,5 +64,12 @@ if __name__ == '__main__':  # required for Windows
     pts3 = time.time() - pts2  # check time elapsed
     print(f"* {num_cores}-core parallel loop takes {pts3} seconds")
     # print(f"* coverage =  {np.mean(out):.4f}")
+
+    # chunked runner: a few large tasks per core, independent seeded streams
+    from mc_runner import run_parallel
+
+    out, telemetry = run_parallel(capture_batch, Rep, workers=num_cores, seed=5821, dtype="bool")
+    print(f"* {num_cores}-core chunked runner: coverage = {np.mean(out):.4f}")
+    print(f"  {telemetry.report()}")
 # %%
 
@@ -4,6 +4,8 @@ import time
 
 import numpy as np
 
+from coverage_engine import coverage
+
 try:
     import cupy as cp
 except ImportError:
@@ -29,13 +31,8 @@ def capture_cpu(_):
 
 
 def coverage_gpu(rep, n, lam):
-    # All replications are generated and processed on GPU in parallel.
-    x = cp.random.poisson(lam=lam, size=(rep, n))
-    xbar = cp.mean(x, axis=1)
-    sig = cp.std(x, axis=1)
-    margin = (1.96 / np.sqrt(n)) * sig
-    covered = (xbar - margin <= lam) & (lam <= xbar + margin)
-    return cp.mean(covered)
+    # Replications are generated and processed on GPU in memory-bounded blocks.
+    return coverage(rep, n, lam, interval="normal", backend="cupy")
 
 
 Rep = 200; sample_size = 200000
@@ -51,6 +48,12 @@ pts1 = time.time() - pts0
 print(f"* single-core CPU loop takes {pts1:.4f} seconds")
 print(f"* CPU coverage = {np.mean(out_cpu):.4f}")
 
+pts0 = time.time()
+out_vec = coverage(Rep, sample_size, mu, interval="normal", backend="numpy")
+pts1 = time.time() - pts0
+print(f"* vectorized CPU engine takes {pts1:.4f} seconds")
+print(f"* vectorized CPU coverage = {out_vec:.4f}")
+
 if __name__ == "__main__":
     if cp is None:
         print("* GPU run skipped: cupy is not installed.")
@@ -66,11 +69,10 @@ if __name__ == "__main__":
 
                 pts2 = time.time()
                 out_gpu = coverage_gpu(Rep, sample_size, mu)
-                cp.cuda.Stream.null.synchronize()
                 pts3 = time.time() - pts2
 
                 print(f"* GPU parallel run takes {pts3:.4f} seconds")
-                print(f"* GPU coverage = {float(out_gpu.get()):.4f}")
+                print(f"* GPU coverage = {out_gpu:.4f}")
         except cp.cuda.runtime.CUDARuntimeError as err:
             print(f"* GPU run skipped: {err}")
 
@@ -0,0 +1,164 @@
+"""
+Concurrent World Bank indicator fetcher.
+
+`fetch_series([SeriesSpec("CHN", "NY.GDP.MKTP.CD"), ...])` requests every
+(country, indicator, date range) spec concurrently from asyncio. A semaphore
+caps the number of requests in flight. All requests share one pooled, cached
+HTTP session (see http_cache.py), whose connection pool is sized when the
+session is created. Connection errors and 429/5xx responses are retried with
+exponential backoff; a body that is not JSON is not retried, and it is
+dropped from the cache. When a series spans several pages, the first page
+gives the page count and the remaining pages are fetched in parallel. All
+records are parsed in one vectorized pass into a long DataFrame with columns
+country, indicator, year and value.
+
+A spec that fails does not cancel the others. Its exception is collected
+and reported in a `FetchError` after every spec has finished, or, with
+`raise_errors=False`, in `df.attrs["failures"]`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+
+import pandas as pd
+import requests
+
+from http_cache import CachedSession, get_session
+
+
+BASE_URL = "http://api.worldbank.org/v2/country/{country}/indicator/{indicator}"
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+@dataclass(frozen=True)
+class SeriesSpec:
+    """One World Bank series: ISO3 country code, indicator code and year range."""
+
+    country: str
+    indicator: str
+    start: int = 1960
+    end: int = 2024
+
+
+class FetchError(RuntimeError):
+    """
+    Some series could not be fetched.
+
+    `failures` maps each failed `SeriesSpec` to its exception, and `frame`
+    holds the series that were fetched.
+    """
+
+    def __init__(self, failures: dict, frame: pd.DataFrame):
+        self.failures = failures
+        self.frame = frame
+        lines = [f"  {spec}: {err!r}" for spec, err in failures.items()]
+        super().__init__(f"{len(failures)} of the requested series failed:\n" + "\n".join(lines))
+
+
+async def _get_json(
+    session: CachedSession,
+    limit: asyncio.Semaphore,
+    url: str,
+    params: dict,
+    retries: int,
+    backoff: float,
+    timeout: float,
+):
+    for attempt in range(retries + 1):
+        try:
+            async with limit:
+                resp = await asyncio.to_thread(session.get, url, params=params, timeout=timeout)
+            break
+        except requests.RequestException as err:
+            status = getattr(err.response, "status_code", None)
+            retryable = status is None or status in RETRY_STATUS
+            if attempt == retries or not retryable:
+                raise
+            await asyncio.sleep(backoff * 2**attempt)
+    try:
+        return resp.json()
+    except requests.JSONDecodeError:
+        # an error page served with status 200; do not keep it for the next run
+        session.invalidate(url, params)
+        raise
+
+
+async def _fetch_one(session, limit, spec: SeriesSpec, per_page: int, **kwargs) -> list[dict]:
+    url = BASE_URL.format(country=spec.country, indicator=spec.indicator)
+    params = {"format": "json", "date": f"{spec.start}:{spec.end}", "per_page": per_page}
+
+    first = await _get_json(session, limit, url, {**params, "page": 1}, **kwargs)
+    if not isinstance(first, list) or len(first) < 2:
+        # e.g. [{"message": ...}] for an unknown indicator
+        session.invalidate(url, {**params, "page": 1})
+        raise RuntimeError(f"Unexpected World Bank response format for {spec}: {str(first)[:200]}")
+    records = list(first[1] or [])
+
+    pages = int(first[0].get("pages", 1))
+    rest = await asyncio.gather(
+        *(_get_json(session, limit, url, {**params, "page": page}, **kwargs) for page in range(2, pages + 1)),
+        return_exceptions=True,
+    )
+    for payload in rest:
+        if isinstance(payload, BaseException):
+            raise payload
+        records.extend(payload[1] or [])
+    return records
+
+
+def records_to_frame(records: list[dict]) -> pd.DataFrame:
+    """Vectorized parse of raw World Bank records into (country, indicator, year, value)."""
+    if not records:
+        return pd.DataFrame({"country": [], "indicator": [], "year": [], "value": []})
+    raw = pd.json_normalize(records)
+    df = pd.DataFrame(
+        {
+            "country": raw["countryiso3code"].where(raw["countryiso3code"] != "", raw["country.id"]),
+            "indicator": raw["indicator.id"],
+            "year": pd.to_numeric(raw["date"], errors="coerce"),
+            "value": pd.to_numeric(raw["value"], errors="coerce"),
+        }
+    )
+    df = df.dropna(subset=["year", "value"]).astype({"year": int})
+    return df.sort_values(["country", "indicator", "year"]).reset_index(drop=True)
+
+
+async def fetch_series_async(
+    specs: list[SeriesSpec],
+    concurrency: int = 8,
+    retries: int = 3,
+    backoff: float = 0.5,
+    per_page: int = 1000,
+    timeout: float = 20,
+    session: CachedSession | None = None,
+    raise_errors: bool = True,
+) -> pd.DataFrame:
+    """
+    Fetch all `specs` concurrently and return one long-format DataFrame.
+
+    `concurrency` should not exceed the session's pool size (16 for the
+    shared session), or requests queue for a connection. Failed specs raise
+    a `FetchError` once all specs have finished; with `raise_errors=False`
+    they are listed in `df.attrs["failures"]` instead.
+    """
+    session = session or get_session()
+    limit = asyncio.Semaphore(concurrency)
+    kwargs = dict(retries=retries, backoff=backoff, timeout=timeout)
+    results = await asyncio.gather(
+        *(_fetch_one(session, limit, spec, per_page, **kwargs) for spec in specs),
+        return_exceptions=True,
+    )
+
+    failures = {spec: res for spec, res in zip(specs, results) if isinstance(res, BaseException)}
+    df = records_to_frame([record for res in results if not isinstance(res, BaseException) for record in res])
+    if failures and raise_errors:
+        raise FetchError(failures, df)
+    df.attrs["failures"] = failures
+    return df
+
+
+def fetch_series(specs: list[SeriesSpec], **kwargs) -> pd.DataFrame:
+    """Blocking wrapper around `fetch_series_async`."""
+    return asyncio.run(fetch_series_async(specs, **kwargs))
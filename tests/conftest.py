@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+# the modules under test are plain scripts in these folders, not a package
+ROOT = Path(__file__).resolve().parents[1]
+for folder in ("scripts", "data_example"):
+    sys.path.insert(0, str(ROOT / folder))
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import datasets
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(datasets, "CACHE_DIR", tmp_path / ".cache")
+
+
+@pytest.mark.parametrize("name", ["ibm3jan2006", "AJR"])
+def test_load_matches_read_csv(name):
+    spec = datasets.DATASETS[name]
+    expected = pd.read_csv(datasets.DATA_DIR / spec.file, **spec.read_csv)
+    datasets.load(name)  # builds the cache
+    pd.testing.assert_frame_equal(datasets.load(name), expected, check_dtype=False)
+
+
+def test_text_missing_values_stay_missing():
+    expected = pd.read_csv(datasets.DATA_DIR / "ibm3jan2006.csv")["ts"]
+    assert expected.isna().any()
+    assert datasets.load("ibm3jan2006", columns=["ts"])["ts"].isna().equals(expected.isna())
+    assert pd.isna(datasets.load_arrays("ibm3jan2006", columns=["ts"])["ts"]).tolist() == expected.isna().tolist()
+
+
+def test_no_columns():
+    df = datasets.load("AJR", columns=[])
+    assert df.shape == (64, 0)
+    assert datasets.load_arrays("AJR", columns=[]) == {}
+
+
+def test_column_subset_keeps_order():
+    df = datasets.load("AJR", columns=["shortnam", datasets.load("AJR").columns[0]][::-1])
+    assert list(df.columns)[-1] == "shortnam"
+    assert isinstance(datasets.load_arrays("AJR", columns=["shortnam"])["shortnam"], np.ndarray)
+
+
+def test_default_frame_is_read_only_and_copy_is_writable():
+    df = datasets.load("AJR")
+    col = df.select_dtypes("number").columns[0]
+    with pytest.raises(ValueError):
+        df.loc[0, col] = 5.0
+    writable = datasets.load("AJR", copy=True)
+    writable.loc[0, col] = 5.0
+    assert writable.loc[0, col] == 5.0
+    # the cache itself is unchanged
+    assert datasets.load("AJR").loc[0, col] == df.loc[0, col]
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+
+from gold_silver import TICKERS, _lines_backwards, append_prices, fetch_prices, last_stored_date
+
+
+class FakeProvider:
+    """Serves a fixed price table and records the requested windows."""
+
+    def __init__(self, prices: pd.DataFrame):
+        self.prices = prices
+        self.calls = []
+
+    def download(self, tickers, start, end=None):
+        self.calls.append((pd.Timestamp(start), end))
+        rows = self.prices.index >= pd.Timestamp(start)
+        if end is not None:
+            rows &= self.prices.index < pd.Timestamp(end)
+        return self.prices.loc[rows, tickers].copy()
+
+
+def _prices(days, seed=0):
+    index = pd.bdate_range("2025-07-01", periods=days, name="Date")
+    rng = np.random.default_rng(seed)
+    data = {"GC=F": 3300 + rng.normal(size=days).cumsum(), "SI=F": 36 + rng.normal(size=days).cumsum()}
+    return pd.DataFrame(data, index=index)[list(TICKERS.values())]
+
+
+def test_without_store_returns_named_columns():
+    provider = FakeProvider(_prices(10))
+    df = fetch_prices("2025-07-01", provider=provider)
+    assert list(df.columns) == ["Gold", "Silver"]
+    assert len(df) == 10
+
+
+def test_incremental_append(tmp_path):
+    store = tmp_path / "gold_silver.csv"
+    prices = _prices(30)
+    first = FakeProvider(prices.iloc[:20])
+    fetch_prices("2025-07-01", provider=first, store=store)
+    assert last_stored_date(store) == prices.index[19]
+    head = store.read_bytes()
+
+    # later run: two overlap days are revised and ten new days arrive
+    revised = prices.copy()
+    revised.iloc[18:20] += 1.0
+    second = FakeProvider(revised)
+    df = fetch_prices("2025-07-01", provider=second, store=store, overlap_days=5)
+
+    assert second.calls == [(prices.index[19] - pd.Timedelta(days=5), None)]
+    assert len(df) == 30 and df.index.is_unique and df.index.is_monotonic_increasing
+    np.testing.assert_allclose(df.to_numpy(), revised.to_numpy())
+    # rows before the revision window are not rewritten
+    kept = head.split(b"\n")[: 1 + 14]
+    assert store.read_bytes().split(b"\n")[: 1 + 14] == kept
+
+
+def test_append_prices_replaces_from_first_new_date(tmp_path):
+    store = tmp_path / "prices.csv"
+    prices = _prices(6).rename(columns={v: k for k, v in TICKERS.items()})
+    append_prices(store, prices.iloc[:4])
+    append_prices(store, prices.iloc[2:] * 2)
+    df = pd.read_csv(store, index_col=0, parse_dates=True)
+    np.testing.assert_allclose(df.iloc[:2].to_numpy(), prices.iloc[:2].to_numpy())
+    np.testing.assert_allclose(df.iloc[2:].to_numpy(), prices.iloc[2:].to_numpy() * 2)
+
+
+def test_empty_store_has_no_last_date(tmp_path):
+    assert last_stored_date(tmp_path / "missing.csv") is None
+    (tmp_path / "empty.csv").write_text("")
+    assert last_stored_date(tmp_path / "empty.csv") is None
+
+
+def test_lines_backwards_across_block_boundaries(tmp_path):
+    store = tmp_path / "prices.csv"
+    _prices(40).to_csv(store)
+    text = store.read_bytes()
+    header = len(text.split(b"\n", 1)[0]) + 1
+    expected = []
+    offset = header
+    for line in text[header:].split(b"\n"):
+        if line:
+            expected.append((offset, line))
+        offset += len(line) + 1
+    for block in (1, 7, 64, 4096):
+        with open(store, "rb") as f:
+            assert list(_lines_backwards(f, header, block)) == expected[::-1]
+
+
+def test_append_replaces_everything_when_overlap_covers_the_store(tmp_path):
+    store = tmp_path / "prices.csv"
+    prices = _prices(5).rename(columns={v: k for k, v in TICKERS.items()})
+    append_prices(store, prices.iloc[2:])
+    append_prices(store, prices)
+    df = pd.read_csv(store, index_col=0, parse_dates=True)
+    np.testing.assert_allclose(df.to_numpy(), prices.to_numpy())
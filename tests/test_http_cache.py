@@ -0,0 +1,89 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from http_cache import CacheMiss, CachedSession
+
+BODY = b'{"value": 42}'
+ETAG = '"v1"'
+
+
+class Handler(BaseHTTPRequestHandler):
+    statuses: list = []
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == ETAG:
+            self.statuses.append(304)
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.statuses.append(200)
+        self.send_response(200)
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def url():
+    Handler.statuses = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}/data"
+    httpd.shutdown()
+
+
+def test_fresh_entry_skips_the_network(url, tmp_path):
+    session = CachedSession(cache_dir=tmp_path, ttl=3600, offline=False)
+    first = session.get(url, params={"a": 1})
+    second = session.get(url, params={"a": 1})
+    assert not first.from_cache and second.from_cache
+    assert second.json() == {"value": 42}
+    assert Handler.statuses == [200]
+
+
+def test_stale_entry_is_revalidated_with_304(url, tmp_path):
+    session = CachedSession(cache_dir=tmp_path, ttl=0, offline=False)
+    session.get(url)
+    stamp = session._load_meta(next(tmp_path.glob("*.json")).stem)["fetched_at"]
+    time.sleep(0.01)
+
+    resp = session.get(url)
+    assert Handler.statuses == [200, 304]
+    assert resp.from_cache and resp.status_code == 200
+    assert resp.content == BODY
+    assert resp.headers["ETag"] == ETAG
+    # the 304 refreshes the entry's age without rewriting the body
+    assert session._load_meta(next(tmp_path.glob("*.json")).stem)["fetched_at"] > stamp
+
+
+def test_download_revalidates_too(url, tmp_path):
+    session = CachedSession(cache_dir=tmp_path, ttl=0, offline=False)
+    path = session.download(url)
+    assert session.download(url) == path
+    assert path.read_bytes() == BODY
+    assert Handler.statuses == [200, 304]
+
+
+def test_offline_mode(url, tmp_path):
+    CachedSession(cache_dir=tmp_path, offline=False).get(url)
+    offline = CachedSession(cache_dir=tmp_path, ttl=0, offline=True)
+    assert offline.get(url).content == BODY
+    with pytest.raises(CacheMiss):
+        offline.get(url, params={"other": 1})
+    assert Handler.statuses == [200]
+
+
+def test_invalidate_forces_a_refetch(url, tmp_path):
+    session = CachedSession(cache_dir=tmp_path, ttl=3600, offline=False)
+    session.get(url)
+    session.invalidate(url)
+    assert not session.get(url).from_cache
+    assert Handler.statuses == [200, 200]
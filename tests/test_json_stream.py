@@ -0,0 +1,94 @@
+import io
+import json
+
+import pandas as pd
+import pytest
+
+from json_stream import convert_json, iter_records
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+RECORDS = [
+    {"a": 1, "b": None},
+    {"a": 2, "b": None},
+    {"a": None, "b": "x", "c": 1.5},
+    {"a": 4, "b": "y", "d": "new"},
+]
+
+
+def _payload(records):
+    return io.BytesIO(json.dumps({"data": records}).encode())
+
+
+def _read(path, fmt):
+    if fmt == "parquet":
+        return pq.read_table(path)
+    with pa.ipc.open_file(str(path)) as reader:
+        return reader.read_all()
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_type_drift_across_batches(tmp_path, fmt):
+    out = tmp_path / f"out.{fmt}"
+    assert convert_json(_payload(RECORDS), out, fmt=fmt, batch_size=2) == 4
+
+    table = _read(out, fmt)
+    assert table.column_names == ["a", "b", "c", "d"]
+    # int64 in the first batch, widened to double when nulls appear
+    assert pa.types.is_floating(table.schema.field("a").type)
+    # all null in the first batch, text later
+    assert pa.types.is_string(table.schema.field("b").type) or pa.types.is_large_string(table.schema.field("b").type)
+    df = table.to_pandas()
+    assert df["a"].tolist()[:2] == [1.0, 2.0] and pd.isna(df["a"][2])
+    assert df["b"].tolist()[2:] == ["x", "y"]
+    assert df["d"].isna().tolist() == [True, True, True, False]
+
+
+def test_mixed_types_become_text(tmp_path):
+    out = tmp_path / "out.parquet"
+    convert_json(_payload([{"v": 1}, {"v": "one"}]), out, batch_size=1)
+    assert pq.read_table(out).column("v").to_pylist() == ["1", "one"]
+
+
+def test_csv_keeps_late_columns(tmp_path):
+    out = tmp_path / "out.csv"
+    convert_json(_payload(RECORDS), out, fmt="csv", batch_size=2)
+    df = pd.read_csv(out)
+    assert list(df.columns) == ["a", "b", "c", "d"]
+    assert df["c"].tolist()[2] == 1.5
+    assert df["d"].tolist()[3] == "new"
+
+
+def test_records_key_and_nested_arrays():
+    body = b'{"meta": {"rows": [1, 2]}, "x": [[1], {"y": []}], "data": [{"a": 1}, {"a": 2}]}'
+    assert list(iter_records(io.BytesIO(body))) == [{"a": 1}, {"a": 2}]
+    assert list(iter_records(io.BytesIO(body), records_key="data")) == [{"a": 1}, {"a": 2}]
+
+
+def test_record_keys_win_over_earlier_arrays(tmp_path):
+    body = b'{"notes": [{"n": "footnote"}], "data": [{"a": 1}, {"a": 2}]}'
+    assert list(iter_records(io.BytesIO(body))) == [{"a": 1}, {"a": 2}]
+    src = tmp_path / "payload.json"
+    src.write_bytes(body)
+    out = tmp_path / "out.csv"
+    assert convert_json(src, out) == 2
+    assert pd.read_csv(out)["a"].tolist() == [1, 2]
+
+
+def test_other_root_arrays_are_the_fallback():
+    body = b'{"meta": {"count": 2}, "items": [{"a": 1}, {"a": 2}], "more": [{"b": 1}]}'
+    assert list(iter_records(io.BytesIO(body))) == [{"a": 1}, {"a": 2}]
+    # nested arrays are not records unless asked for by key
+    assert list(iter_records(io.BytesIO(b'{"meta": {"items": [{"a": 1}]}}'))) == []
+    assert list(iter_records(io.BytesIO(b'{"meta": {"items": [{"a": 1}]}}'), records_key="items")) == [{"a": 1}]
+    # a record key wins even when nested
+    body = b'{"notes": [{"n": 1}], "result": {"data": [{"a": 1}]}}'
+    assert list(iter_records(io.BytesIO(body))) == [{"a": 1}]
+
+
+@pytest.mark.parametrize("body", [b'}{"data": [{"a": 1}]}', b'{"x": [1}, "data": [{"a": 1}]}'])
+def test_unbalanced_input_raises_value_error(body):
+    with pytest.raises(ValueError):
+        list(iter_records(io.BytesIO(body)))
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from lasso_path import lambda_grid, lasso_cv, lasso_path
+
+cp = pytest.importorskip("cvxpy")
+
+
+def _objective(X, y, coef, lam):
+    return 0.5 * np.sum((y - X @ coef) ** 2) + lam * np.abs(coef).sum()
+
+
+def _data(n, p, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n, p))
+    beta = np.zeros(p)
+    beta[:2] = 1
+    return X, X @ beta + 0.5 * rng.standard_normal(n)
+
+
+@pytest.mark.parametrize("n, p", [(100, 20), (40, 120)])
+def test_path_matches_cvxpy(n, p):
+    # the py_07 example (n > p) and a wide design (n < p)
+    X, y = _data(n, p)
+    lambdas = np.logspace(-2, 3, 30)
+    path = lasso_path(X, y, lambdas, tol=1e-10)
+
+    beta = cp.Variable(p)
+    lam = cp.Parameter(nonneg=True)
+    problem = cp.Problem(cp.Minimize(0.5 * cp.sum_squares(X @ beta - y) + lam * cp.norm1(beta)))
+    for val, coef in zip(path.lambdas, path.coefs):
+        lam.value = val
+        problem.solve(solver=cp.CLARABEL)
+        reference = _objective(X, y, beta.value, val)
+        # never worse than the interior-point solution, up to rounding
+        assert _objective(X, y, coef, val) <= reference + 1e-9 * max(1.0, reference)
+        np.testing.assert_allclose(coef, beta.value, atol=1e-4)
+
+
+def test_path_starts_empty_and_respects_kkt():
+    X, y = _data(100, 20, seed=1)
+    path = lasso_path(X, y)
+    np.testing.assert_allclose(path.lambdas, lambda_grid(X, y))
+    assert not path.coefs[0].any()
+    for lam, coef in zip(path.lambdas, path.coefs):
+        grad = X.T @ (y - X @ coef)
+        active = coef != 0
+        assert np.all(np.abs(grad) <= lam * (1 + 1e-6))
+        np.testing.assert_allclose(grad[active], lam * np.sign(coef[active]), rtol=1e-5)
+
+
+def test_cv_is_reproducible():
+    X, y = _data(80, 30, seed=2)
+    first = lasso_cv(X, y, folds=4, workers=1)
+    second = lasso_cv(X, y, folds=4, workers=2)
+    np.testing.assert_allclose(first["cv_mse"], second["cv_mse"])
+    assert first["lambda_1se"] >= first["lambda_min"]
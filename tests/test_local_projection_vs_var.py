@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from local_projection_vs_var import IRFAccumulator, QuantileSketch, run_simulation, summarize_draws
+
+
+def _draws(n, shape=(13, 3), seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.standard_normal((n,) + shape) * rng.uniform(0.5, 2.0, shape)
+
+
+def test_sketch_is_exact_before_compaction():
+    draws = _draws(500)
+    sketch = QuantileSketch(draws.shape[1:], k=1000)
+    for lo in range(0, 500, 25):
+        sketch.update(draws[lo : lo + 25])
+    for prob in (0.025, 0.5, 0.975):
+        np.testing.assert_allclose(sketch.quantile(prob), np.quantile(draws, prob, axis=0))
+
+
+def test_sketch_error_is_small_and_memory_bounded():
+    draws = _draws(100_000)
+    sketch = QuantileSketch(draws.shape[1:], k=1024)
+    for lo in range(0, len(draws), 25):
+        sketch.update(draws[lo : lo + 25])
+    assert sum(len(items) for items in sketch.levels) <= 3 * 1024
+    gap = np.abs(sketch.quantile(0.025) - np.quantile(draws, 0.025, axis=0)) / draws.std(axis=0)
+    assert gap.mean() < 0.02
+
+
+def test_sketch_merge_matches_single_pass():
+    draws = _draws(4000, shape=(5,))
+    left, right = QuantileSketch((5,), k=256), QuantileSketch((5,), k=256)
+    left.update(draws[:2000])
+    right.update(draws[2000:])
+    left.merge(right)
+    assert left.count == 4000
+    gap = np.abs(left.quantile(0.975) - np.quantile(draws, 0.975, axis=0))
+    assert gap.max() < 0.1
+
+
+def test_accumulator_matches_exact_summary():
+    draws = _draws(3000)
+    acc = IRFAccumulator(draws.shape[1:])
+    for lo in range(0, len(draws), 100):
+        acc.update(draws[lo : lo + 100])
+    exact, online = summarize_draws(draws), acc.summary()
+    np.testing.assert_allclose(online.mean, exact.mean)
+    np.testing.assert_allclose(online.std, exact.std)
+    np.testing.assert_allclose(online.lower, exact.lower)
+    np.testing.assert_allclose(online.upper, exact.upper)
+
+
+def test_empty_accumulator_raises():
+    with pytest.raises(ValueError):
+        IRFAccumulator((2, 2)).summary()
+
+
+def test_stream_matches_stored_draws():
+    stored = run_simulation(reps=200, T=80, burn=20, horizon=4)
+    streamed = run_simulation(reps=200, T=80, burn=20, horizon=4, stream=True)
+    np.testing.assert_allclose(streamed.lp.mean, stored.lp.mean)
+    np.testing.assert_allclose(streamed.var.lower, stored.var.lower)
+
+
+def _panel(reps, T=150, params=None, seed=3):
+    from local_projection_vs_var import default_dgp_params, simulate_panel
+
+    params = params or default_dgp_params()
+    return simulate_panel(reps=reps, T=T, burn=50, params=params, rng=np.random.default_rng(seed))
+
+
+@pytest.mark.parametrize("p", [1, 2])
+def test_lp_matches_statsmodels_ols_hc1(p):
+    sm = pytest.importorskip("statsmodels.api")
+    from local_projection_vs_var import estimate_lp_batch
+
+    y, eps = _panel(reps=3)
+    shock = eps[..., 0]
+    horizon = 4
+    est = estimate_lp_batch(y, shock, horizon=horizon, p=p)
+    T, n_vars = y.shape[1:]
+    for r in range(3):
+        for h in range(horizon + 1):
+            rows = np.arange(p, T - h)
+            lags = [y[r, rows - lag] for lag in range(1, p + 1)]
+            X = np.column_stack([np.ones(len(rows)), shock[r, rows]] + lags)
+            for v in range(n_vars):
+                fit = sm.OLS(y[r, rows + h, v], X).fit(cov_type="HC1")
+                np.testing.assert_allclose(est.coef[r, h, v], fit.params[1], rtol=1e-9, atol=1e-12)
+                # atol: at h = 0 the shocked variable is fitted exactly and both se are rounding noise
+                np.testing.assert_allclose(est.se[r, h, v], fit.bse[1], rtol=1e-9, atol=1e-12)
+
+
+@pytest.mark.parametrize("p", [1, 2])
+def test_var_irf_matches_statsmodels(p):
+    tsa = pytest.importorskip("statsmodels.tsa.api")
+    from local_projection_vs_var import estimate_var_batch, trivariate_var2_params
+
+    y, _ = _panel(reps=2, params=trivariate_var2_params())
+    horizon = 8
+    out = estimate_var_batch(y, horizon=horizon, p=p)
+    for r in range(2):
+        irf = tsa.VAR(y[r]).fit(p, trend="c").irf(horizon).orth_irfs[:, :, 0]
+        np.testing.assert_allclose(out[r], irf, rtol=1e-9, atol=1e-12)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from sandwich import SandwichCovariance, lpm, sandwich_cov
+
+sm = pytest.importorskip("statsmodels.api")
+
+
+@pytest.fixture
+def batch():
+    rng = np.random.default_rng(0)
+    X = np.concatenate([np.ones((4, 1, 300, 1)), rng.normal(size=(4, 1, 300, 2))], axis=-1)
+    y = X[:, 0] @ np.array([1.0, 2.0, 3.0]) + rng.normal(size=(4, 300)) * (1 + np.abs(X[:, 0, :, 1]))
+    fits = [sm.OLS(y[r], X[r, 0]).fit() for r in range(4)]
+    return X, np.stack([f.resid for f in fits])[:, None, :], fits
+
+
+@pytest.mark.parametrize("kind", ["HC0", "HC1", "HC2", "HC3"])
+def test_batched_hc_matches_statsmodels(batch, kind):
+    X, resid, fits = batch
+    V = sandwich_cov(X, resid, kind, chunk_size=70)
+    assert V.shape == (4, 1, 3, 3)
+    for r, fit in enumerate(fits):
+        np.testing.assert_allclose(V[r, 0], fit.get_robustcov_results(kind).cov_params(), rtol=1e-10)
+
+
+def test_hac_and_cluster_match_statsmodels(batch):
+    X, resid, fits = batch
+    X, e, fit = X[0, 0], resid[0, 0], fits[0]
+    hac = sandwich_cov(X, e, "HAC", lags=4, chunk_size=50)
+    np.testing.assert_allclose(hac, fit.get_robustcov_results("HAC", maxlags=4).cov_params(), rtol=1e-10)
+
+    groups = np.arange(300) // 7
+    clustered = sandwich_cov(X, e, "cluster", clusters=groups, chunk_size=50)
+    expected = fit.get_robustcov_results("cluster", groups=groups).cov_params()
+    np.testing.assert_allclose(clustered, expected, rtol=1e-10)
+
+
+def test_lpm_meat_equals_dense_formula():
+    X, e_hat = lpm(2000, np.random.default_rng(1))
+    acc = SandwichCovariance("HC0")
+    for lo in range(0, 2000, 300):
+        acc.update(X[lo : lo + 300], e_hat[lo : lo + 300])
+    np.testing.assert_allclose(acc.meat, X.T @ np.diag(e_hat**2) @ X, rtol=1e-12)
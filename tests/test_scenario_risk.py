@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from scenario_risk import ScenarioModel, var_es_stream
+
+
+@pytest.fixture
+def model():
+    return ScenarioModel([0.5, 0.3, 0.2], [0.001] * 3, np.diag([0.02, 0.03, 0.04]) ** 2, kind="t")
+
+
+def sorted_losses(model, n_sims, chunk, seed):
+    sizes = [min(chunk, n_sims - lo) for lo in range(0, n_sims, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    losses = np.concatenate([-model.portfolio_returns(m, np.random.default_rng(s)) for s, m in zip(seeds, sizes)])
+    return np.sort(losses)[::-1]
+
+
+@pytest.mark.parametrize("max_tail", [1_000_000, 300])
+def test_matches_full_sort(model, max_tail):
+    # everything fits in one pass, or the brackets are narrowed over several
+    losses = sorted_losses(model, 50_000, 7_000, seed=3)
+    table = var_es_stream(model, 50_000, alphas=(0.95, 0.99), chunk_size=7_000, seed=3, max_tail=max_tail)
+    assert table.VaR.tolist() == [losses[2499], losses[499]]
+    np.testing.assert_allclose(table.ES, [losses[:2500].mean(), losses[:500].mean()], rtol=1e-12)
+
+
+def test_memory_budget_sets_chunks(model):
+    # a budget of 24 * 3 * 1000 bytes gives chunks of 1000 rows
+    by_budget = var_es_stream(model, 20_000, memory_budget=24 * 3 * 1000, seed=1)
+    by_size = var_es_stream(model, 20_000, chunk_size=1000, seed=1)
+    np.testing.assert_array_equal(by_budget.to_numpy(), by_size.to_numpy())
+
+
+def test_workers_do_not_change_results(model):
+    small = [var_es_stream(model, 200_000, memory_budget=24 * 3 * 20_000, workers=w) for w in (1, 4)]
+    np.testing.assert_array_equal(small[0].to_numpy(), small[1].to_numpy())
+    # default budget: several chunks, run by several workers
+    full = [var_es_stream(model, 1_000_000, workers=w) for w in (1, 4)]
+    np.testing.assert_array_equal(full[0].to_numpy(), full[1].to_numpy())
+
+
+def test_bounded_tail_with_workers(model):
+    # 400 losses above the 99.8% VaR, more than max_tail: narrowed in worker processes
+    table = var_es_stream(model, 200_000, alphas=(0.998,), chunk_size=20_000, workers=4, seed=5, max_tail=100)
+    losses = sorted_losses(model, 200_000, 20_000, seed=5)
+    assert table.VaR[0] == losses[399]
+    np.testing.assert_allclose(table.ES[0], losses[:400].mean(), rtol=1e-12)
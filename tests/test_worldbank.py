@@ -0,0 +1,106 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+import worldbank
+from http_cache import CachedSession, cache_key
+from worldbank import FetchError, SeriesSpec, fetch_series
+
+
+def _page(country, page, pages):
+    years = range(2000 + 2 * (page - 1), 2000 + 2 * page)
+    records = [
+        {"countryiso3code": country, "country": {"id": country[:2]}, "indicator": {"id": "IND"}, "date": str(y), "value": y}
+        for y in years
+    ]
+    return [{"page": page, "pages": pages}, records]
+
+
+class Handler(BaseHTTPRequestHandler):
+    hits: dict = {}
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        country = url.path.split("/")[3]
+        page = int(parse_qs(url.query)["page"][0])
+        self.hits[country] = self.hits.get(country, 0) + 1
+        if country == "BAD":
+            body = b"<html>maintenance</html>"
+        elif country == "ERR":
+            self.send_response(500)
+            self.end_headers()
+            return
+        else:
+            body = json.dumps(_page(country, page, pages=2)).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    Handler.hits = {}
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{httpd.server_port}/v2/country/{{country}}/indicator/{{indicator}}"
+    monkeypatch.setattr(worldbank, "BASE_URL", base)
+    yield base
+    httpd.shutdown()
+
+
+@pytest.fixture
+def session(tmp_path):
+    return CachedSession(cache_dir=tmp_path, ttl=3600, offline=False, pool_size=4)
+
+
+def test_pages_are_concatenated(server, session):
+    df = fetch_series([SeriesSpec("CHN", "IND"), SeriesSpec("USA", "IND")], session=session)
+    assert df.groupby("country").year.apply(list).to_dict() == {
+        "CHN": [2000, 2001, 2002, 2003],
+        "USA": [2000, 2001, 2002, 2003],
+    }
+
+
+def test_failures_are_reported_per_spec(server, session):
+    specs = [SeriesSpec("CHN", "IND"), SeriesSpec("BAD", "IND"), SeriesSpec("ERR", "IND")]
+    with pytest.raises(FetchError) as info:
+        fetch_series(specs, session=session, retries=1, backoff=0.0)
+    failures = info.value.failures
+    assert set(failures) == set(specs[1:])
+    assert isinstance(failures[specs[1]], requests.JSONDecodeError)
+    assert isinstance(failures[specs[2]], requests.HTTPError)
+    assert info.value.frame.country.unique().tolist() == ["CHN"]
+
+    df = fetch_series(specs, session=session, retries=1, backoff=0.0, raise_errors=False)
+    assert set(df.attrs["failures"]) == set(specs[1:])
+
+
+def test_bad_json_is_not_retried_or_cached(server, session):
+    spec = SeriesSpec("BAD", "IND")
+    fetch_series([spec], session=session, retries=3, backoff=0.0, raise_errors=False)
+    assert Handler.hits["BAD"] == 1
+
+    url = server.format(country="BAD", indicator="IND")
+    params = {"format": "json", "date": f"{spec.start}:{spec.end}", "per_page": 1000, "page": 1}
+    assert not any(p.exists() for p in session._paths(cache_key(url, params)))
+    fetch_series([spec], session=session, retries=3, backoff=0.0, raise_errors=False)
+    assert Handler.hits["BAD"] == 2
+
+
+def test_server_errors_are_retried(server, session):
+    fetch_series([SeriesSpec("ERR", "IND")], session=session, retries=2, backoff=0.0, raise_errors=False)
+    assert Handler.hits["ERR"] == 3
+
+
+def test_pool_is_sized_once(session):
+    adapter = session.session.get_adapter("http://example.org")
+    assert adapter._pool_maxsize == 4